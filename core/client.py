@@ -58,7 +58,8 @@ def _setup_client(
     client_session = net.HTTPNet()
     # Cache
     redis_hash = cache.Hash(config)
-    mem_cache = cache.Memory[typing.Any, typing.Any]()
+    # Bounded since item embeds are cached forever otherwise.
+    mem_cache = cache.BoundedMemory[typing.Any, typing.Any](1024)
     # yuyo client
     yuyo_client = yuyo.ComponentClient.from_gateway_bot(bot, event_managed=False)
 
@@ -70,10 +71,13 @@ def _setup_client(
         .add_client_callback(tanjun.ClientCallbackNames.CLOSING, pg_pool.partial.close)
         # HTTP.
         .set_type_dependency(traits.NetRunner, client_session)
+        .add_client_callback(tanjun.ClientCallbackNames.CLOSING, client_session.close)
         # Cache. This is kinda overkill but we need the memory cache for api requests
         # And the redis hash for stuff that are not worth storing in a database for the sake of speed.
         # i.e., OAuth2 tokens
         .set_type_dependency(traits.HashRunner, redis_hash)
+        .add_client_callback(tanjun.ClientCallbackNames.STARTING, redis_hash.open)
+        .add_client_callback(tanjun.ClientCallbackNames.CLOSING, redis_hash.close)
         .set_type_dependency(cache.Memory, mem_cache)
         # yuyo
         .set_type_dependency(yuyo.ComponentClient, yuyo_client)
@@ -28,6 +28,7 @@ from __future__ import annotations
 __all__: tuple[str] = ("api",)
 
 import typing
+import urllib.parse
 
 import alluka
 import hikari
@@ -36,6 +37,13 @@ import yuyo
 
 from core.std import boxed, traits
 
+_RANDOM_API: typing.Final[str] = "https://some-random-api.ml"
+_DOG: typing.Final[str] = f"{_RANDOM_API}/animal/dog"
+_CAT: typing.Final[str] = f"{_RANDOM_API}/animal/cat"
+_WINK: typing.Final[str] = f"{_RANDOM_API}/animu/wink"
+_PAT: typing.Final[str] = f"{_RANDOM_API}/animu/pat"
+_JAIL: typing.Final[str] = f"{_RANDOM_API}/canvas/jail"
+
 
 # Fun stuff.
 @tanjun.as_message_command("dog")
@@ -44,11 +52,7 @@ async def doggo(
     net: alluka.Injected[traits.NetRunner],
 ) -> None:
     async with net as client:
-        resp = await client.request(
-            "GET",
-            "https://some-random-api.ml/animal/dog",
-        )
-        assert isinstance(resp, dict)
+        resp = typing.cast(dict[str, str], await client.request("GET", _DOG))
         embed = hikari.Embed(description=resp["fact"])
         embed.set_image(resp["image"])
 
@@ -61,8 +65,7 @@ async def cat(
     net: alluka.Injected[traits.NetRunner],
 ) -> None:
     async with net as client:
-        resp = await client.request("GET", "https://some-random-api.ml/animal/cat")
-        assert isinstance(resp, dict)
+        resp = typing.cast(dict[str, str], await client.request("GET", _CAT))
         embed = hikari.Embed(description=resp["fact"])
         embed.set_image(resp["image"])
 
@@ -78,10 +81,7 @@ async def wink(
     net: alluka.Injected[traits.NetRunner],
 ) -> None:
     async with net as client:
-        resp = await client.request(
-            "GET", "https://some-random-api.ml/animu/wink", getter="link"
-        )
-        assert isinstance(resp, str)
+        resp = typing.cast(str, await client.request("GET", _WINK, getter="link"))
         embed = hikari.Embed(
             description=f"{ctx.author.username} winked at {member.username if member else 'their self'} UwU!"
         )
@@ -99,10 +99,7 @@ async def pat(
     net: alluka.Injected[traits.NetRunner],
 ) -> None:
     async with net as client:
-        resp = await client.request(
-            "GET", "https://some-random-api.ml/animu/pat", getter="link"
-        )
-        assert isinstance(resp, str)
+        resp = typing.cast(str, await client.request("GET", _PAT, getter="link"))
         embed = hikari.Embed(
             description=f"{ctx.author.username} pats {member.username if member else 'their self'} UwU!"
         )
@@ -125,7 +122,7 @@ async def jail(
         assert member is not None
         resp = await client.request(
             "GET",
-            f"https://some-random-api.ml/canvas/jail?avatar={member.avatar_url}",
+            f"{_JAIL}?{urllib.parse.urlencode({'avatar': str(member.avatar_url)})}",
             unwrap_bytes=True,
         )
         embed = hikari.Embed(
@@ -154,7 +151,7 @@ async def run_net(
         try:
             result = await cli.request(method, url, getter=getter)
         except Exception:
-            await ctx.respond(boxed.error(str=True))
+            await ctx.respond(boxed.error(as_str=True))
             return
 
         formatted = boxed.with_block(result, lang="json")
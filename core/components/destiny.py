@@ -28,6 +28,7 @@ from __future__ import annotations
 __all__: tuple[str] = ("destiny",)
 
 import asyncio
+import itertools
 import typing
 import urllib.parse
 
@@ -411,7 +412,7 @@ async def user_command(
         )
 
     try:
-        user = await client.fetch_current_user_memberships(tokens.get("access"))
+        user = await client.fetch_current_user_memberships(tokens.access)
     except aiobungie.Unauthorized:
         raise
 
@@ -460,8 +461,12 @@ async def friend_list_command(
             "Youre not authorized. Type `/destiny sync` to sync your account."
         )
 
+    access = tokens.access
+    # Both requests only need the access token, so run them concurrently.
     try:
-        friend_list = await client.fetch_friends(tokens.get("access"))
+        friend_list, requests = await asyncio.gather(
+            client.fetch_friends(access), client.fetch_friend_requests(access)
+        )
     except aiobungie.HTTPError as e:
         raise tanjun.CommandError(e.message)
 
@@ -478,7 +483,7 @@ async def friend_list_command(
         return "\n".join(
             [
                 f"{check_status(friend.online_status)} `{friend.unique_name}`"
-                for friend in friend_list_[:15]
+                for friend in itertools.islice(friend_list_, 15)
             ]
         )
 
@@ -493,7 +498,6 @@ async def friend_list_command(
     if friend_list:
         embed.add_field("Friends", build_friends(friend_list))
 
-    requests = await client.fetch_friend_requests(tokens.get("access"))
     if incoming := requests.incoming:
         embed.add_field("Incoming requests", build_friends(incoming))
 
@@ -570,13 +574,13 @@ async def guardians(
 
 @destiny_group.with_command
 @tanjun.with_str_slash_option(
-    "activity", "The activity to look for.", choices=boxed.iter(_ACTIVITIES)
+    "activity", "The activity to look for.", choices=boxed.keys_of(_ACTIVITIES)
 )
 @tanjun.with_str_slash_option(
     "platform",
     "Specify a platform to filter the results.",
     default=aiobungie.FireteamPlatform.ANY,
-    choices=boxed.iter(_PLATFORMS),
+    choices=boxed.keys_of(_PLATFORMS),
 )
 @tanjun.as_slash_command("lfg", "Look for fireteams to play with.")
 async def lfg_command(
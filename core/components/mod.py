@@ -231,10 +231,11 @@ async def remove(
     key: typing.Any,
     cache_: alluka.Injected[cache.Memory[typing.Any, typing.Any]],
 ) -> None:
-    if key not in cache_:
+    try:
+        del cache_[key]
+    except KeyError:
         return
 
-    del cache_[key]
     await ctx.respond("Ok")
 
 
@@ -34,17 +34,17 @@ import hikari
 
 if typing.TYPE_CHECKING:
     import collections.abc as collections
-    import datetime
     from typing import Self
 
 
-class Tokens(typing.TypedDict):
+@attrs.frozen(weakref_slot=False)
+class Tokens:
     """A view of a bungie user tokens fetched from a redis hash."""
 
     access: str
     refresh: str
     expires: float
-    date: datetime.datetime
+    date: float
 
 
 @attrs.frozen(kw_only=True, weakref_slot=False)
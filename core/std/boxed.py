@@ -26,7 +26,7 @@ from __future__ import annotations
 
 __all__ = (
     "COLOR",
-    "iter",
+    "keys_of",
     "randomize",
     "generate_component",
     "naive_datetime",
@@ -61,6 +61,14 @@ COLOR: typing.Final[
 }
 """Colors."""
 
+_TRIGGERS: typing.Final[tuple[str, ...]] = (
+    yuyo.pagination.LEFT_DOUBLE_TRIANGLE,
+    yuyo.pagination.LEFT_TRIANGLE,
+    yuyo.pagination.STOP_SQUARE,
+    yuyo.pagination.RIGHT_TRIANGLE,
+    yuyo.pagination.RIGHT_DOUBLE_TRIANGLE,
+)
+
 
 def naive_datetime(datetime_: datetime.datetime) -> datetime.datetime:
     return datetime_.astimezone(datetime.timezone.utc)
@@ -77,13 +85,7 @@ async def generate_component(
     pages = yuyo.ComponentPaginator(
         iterable,
         authors=(ctx.author,),
-        triggers=(
-            yuyo.pagination.LEFT_DOUBLE_TRIANGLE,
-            yuyo.pagination.LEFT_TRIANGLE,
-            yuyo.pagination.STOP_SQUARE,
-            yuyo.pagination.RIGHT_TRIANGLE,
-            yuyo.pagination.RIGHT_DOUBLE_TRIANGLE,
-        ),
+        triggers=_TRIGGERS,
     )
 
     if next_ := await pages.get_next_entry():
@@ -97,10 +99,10 @@ async def generate_component(
         component_client.register_executor(pages, message=message)
 
 
-def iter(
-    map: collections.Mapping[str, typing.Any],
+def keys_of(
+    mapping: collections.Mapping[str, typing.Any],
 ) -> collections.Sequence[str]:
-    return tuple(map.keys())
+    return tuple(mapping.keys())
 
 
 def randomize(seq: collections.Sequence[_T]) -> _T:
@@ -119,8 +121,9 @@ async def spawn(
 
 def parse_code(*, code: str, lang: str = "sql") -> str:
     """Remove codeblock from code."""
-    if code.startswith(f"```{lang}") and code.endswith("```"):
-        code = code.replace("```", "").replace(lang, "")
+    prefix = f"```{lang}"
+    if code.startswith(prefix) and code.endswith("```"):
+        return code.removeprefix(prefix).removesuffix("```")
     return code
 
 
@@ -135,11 +138,11 @@ def error(
     ]
     | tuple[None, None, None]
     | None = None,
-    str: bool = False,
+    as_str: bool = False,
 ) -> BaseException | str | None:
     """Return the last detected exception"""
     if source is None:
-        if str:
+        if as_str:
             return with_block(sys.exc_info()[1])
         return sys.exc_info()[1]
     return source[1]
@@ -23,19 +23,19 @@
 
 from __future__ import annotations
 
-__all__: tuple[str, ...] = ("Memory", "Hash")
+__all__: tuple[str, ...] = ("Memory", "BoundedMemory", "Hash")
 
 import asyncio
 import datetime
+import functools
 import logging
-import math
 import time
 import typing
+import weakref
 
 import aiobungie
 import hikari
 import redis.asyncio as redis
-from hikari.internal import collections as hikari_collections
 from hikari.internal import data_binding
 
 from core import models
@@ -50,6 +50,49 @@ _LOG: typing.Final[logging.Logger] = logging.getLogger("fated.cache")
 
 MKT = typing.TypeVar("MKT")
 MVT = typing.TypeVar("MVT")
+_T = typing.TypeVar("_T")
+
+_MISSING: typing.Final[typing.Any] = object()
+# Past this many users the least recently used tokens are read back from redis.
+_TOKENS_CAPACITY: typing.Final[int] = 4096
+
+# hikari binds these to orjson when installed, which `hikari[speedups]` does.
+_dumps = data_binding.default_json_dumps
+_loads = data_binding.default_json_loads
+
+
+# Snowflakes are immutable so their redis key never changes, build them once.
+@functools.lru_cache(maxsize=4096)
+def _snowflake_key(snowflake: int) -> str:
+    return str(snowflake)
+
+
+# Bungie gives us a lifetime in seconds, we store when it ends in wall-clock time
+# with a small margin so it stays valid across restarts.
+def _expires_at(expires_in: int) -> float:
+    return time.time() + (expires_in * 99) // 100
+
+
+# Records written before tokens stored epoch floats have a string `date` and an
+# `expires` that isn't wall-clock time. They're loaded with neither, which makes
+# the next lookup refresh them.
+def _decode_tokens(data: dict[str, typing.Any]) -> models.Tokens:
+    date = data["date"]
+    if not isinstance(date, float):
+        return models.Tokens(data["access"], data["refresh"], 0.0, 0.0)
+
+    return models.Tokens(data["access"], data["refresh"], data["expires"], date)
+
+
+def _format_date(date: float) -> datetime.datetime | str:
+    return datetime.datetime.fromtimestamp(date) if date else "unknown"
+
+
+# Loads and refreshes only store a user's tokens while they hold the user's
+# current generation, removing the tokens starts a new one.
+@typing.final
+class _Generation:
+    __slots__ = ("__weakref__",)
 
 
 @typing.final
@@ -57,9 +100,12 @@ class Hash(traits.HashRunner):
     __slots__: typing.Sequence[str] = (
         "__connection",
         "_aiobungie_client",
-        "_lock",
+        "_inflight",
         "_config",
-        "_expiring_map",
+        "_tokens",
+        "_pending_writes",
+        "_generations",
+        "_closed",
     )
 
     def __init__(
@@ -70,8 +116,14 @@ class Hash(traits.HashRunner):
     ) -> None:
         self._config = config
         self._aiobungie_client = aiobungie_client
-        self._lock = asyncio.Lock()
-        self._expiring_map = Memory[hikari.Snowflake, float]()
+        self._inflight: dict[hikari.Snowflake, asyncio.Task[models.Tokens]] = {}
+        # Tokens live for an hour, so most lookups never need to hit redis.
+        self._tokens = BoundedMemory[hikari.Snowflake, models.Tokens](_TOKENS_CAPACITY)
+        self._pending_writes: dict[hikari.Snowflake, asyncio.Future[typing.Any]] = {}
+        self._generations: weakref.WeakValueDictionary[
+            hikari.Snowflake, _Generation
+        ] = weakref.WeakValueDictionary()
+        self._closed = False
         self.__connection: redis.Redis | None = None
 
     def __repr__(self) -> str:
@@ -81,17 +133,49 @@ class Hash(traits.HashRunner):
         if self.__connection is not None:
             raise RuntimeError("Redis cache already open.") from None
 
-        pool_conn = redis.ConnectionPool(
-            host=self._config.REDIS_HOST,
-            port=self._config.REDIS_PORT,
-            password=self._config.REDIS_PASSWORD,
-            retry_on_timeout=True,
-        )
-        self.__connection = redis.Redis(connection_pool=pool_conn)
+        self._closed = False
+        self._connection()
 
     async def close(self) -> None:
+        # Refreshes are awaited rather than cancelled, Bungie may have already
+        # rotated the tokens they're about to store.
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes.values(), return_exceptions=True)
+
+        self._closed = True
         if self.__connection is not None:
-            await self.__connection.close()
+            # We own the pool, so redis won't close it for us.
+            await self.__connection.aclose(close_connection_pool=True)
+            self.__connection = None
+
+    # The pool only connects on the first command, so building it here is cheap
+    # and nothing touches redis until it's actually used.
+    def _connection(self) -> redis.Redis:
+        if self.__connection is None:
+            # Otherwise anything still running after close() would quietly open
+            # a new pool that nothing closes.
+            if self._closed:
+                raise RuntimeError("Redis cache is closed.") from None
+
+            # Blocks for a free connection when the pool is full instead of
+            # raising, but only for so long.
+            pool_conn = redis.BlockingConnectionPool(
+                host=self._config.REDIS_HOST,
+                port=self._config.REDIS_PORT,
+                password=self._config.REDIS_PASSWORD,
+                retry_on_timeout=True,
+                socket_timeout=2,
+                socket_connect_timeout=1,
+                max_connections=self._config.REDIS_POOL_SIZE,
+                timeout=2,
+                health_check_interval=30,
+            )
+            self.__connection = redis.Redis(connection_pool=pool_conn)
+
+        return self.__connection
 
     def client(self, client: aiobungie.traits.ClientApp) -> None:
         self._aiobungie_client = client
@@ -100,90 +184,181 @@ class Hash(traits.HashRunner):
         self, user: hikari.Snowflake, response: aiobungie.builders.OAuth2Response
     ) -> None:
         await self.__dump_tokens(
-            user, response.access_token, response.refresh_token, response.expires_in
+            user,
+            response.access_token,
+            response.refresh_token,
+            _expires_at(response.expires_in),
         )
 
     async def remove_bungie_tokens(self, user: hikari.Snowflake) -> None:
-        assert self.__connection is not None
-        await self.__connection.hdel("tokens", str(user))  # type: ignore
+        self._generations.pop(user, None)
+        self._tokens.pop(user, None)
+        # Calls already waiting on this refresh get a LookupError, new calls
+        # start their own.
+        self._inflight.pop(user, None)
+        # A background write of this user's tokens may still be on its way,
+        # let it land before we delete them.
+        if (write := self._pending_writes.get(user)) is not None:
+            await asyncio.wait((write,))
+
+        await self._connection().hdel("tokens", _snowflake_key(user))  # type: ignore
 
     async def get_bungie_tokens(self, user: hikari.Snowflake) -> models.Tokens:
-        is_expired = await self._is_expired(user)
-
-        if (tokens := await self.__loads_tokens(user)) and not is_expired:
+        if (tokens := self._fresh_tokens(user)) is not None:
             return tokens
 
-        async with self._lock:
-            if (tokens := await self.__loads_tokens(user)) and not is_expired:
+        if (refresh := self._inflight.get(user)) is None:
+            generation = self._generation(user)
+            tokens = await self.__loads_tokens(user, generation)
+            if time.time() < tokens.expires:
                 return tokens
 
-        response = await self.__refresh_token(user)
+            # Another call may have started refreshing while we were loading.
+            if (refresh := self._inflight.get(user)) is None:
+                refresh = self._inflight[user] = asyncio.create_task(
+                    self.__refresh_and_dump(user, tokens, generation)
+                )
+                refresh.add_done_callback(functools.partial(self._refresh_done, user))
 
-        expiry = time.monotonic() + math.floor(response.expires_in * 0.99)
-        self._expiring_map[user] = expiry
-        return await self.__dump_tokens(
-            user, response.access_token, response.refresh_token, expiry
-        )
+        # All calls for the same user wait on one refresh, shielded so a cancelled
+        # command doesn't cancel it for everyone else.
+        return await asyncio.shield(refresh)
+
+    def _refresh_done(
+        self, user: hikari.Snowflake, task: asyncio.Task[models.Tokens]
+    ) -> None:
+        # The user may have been removed and started a new refresh since.
+        if self._inflight.get(user) is task:
+            del self._inflight[user]
+
+    # Generations are weakly referenced so they're dropped once nothing is
+    # loading or refreshing that user's tokens.
+    def _generation(self, user: hikari.Snowflake) -> _Generation:
+        if (generation := self._generations.get(user)) is None:
+            generation = self._generations[user] = _Generation()
+
+        return generation
+
+    # Returns the in-memory tokens of a user if they're still valid.
+    def _fresh_tokens(self, user: hikari.Snowflake) -> models.Tokens | None:
+        tokens = self._tokens.get(user)
+        if tokens is not None and time.time() < tokens.expires:
+            return tokens
 
-    # Check whether the Bungie OAuth tokens are expired or not.
-    # If expired we refresh them.
-    async def _is_expired(self, user: hikari.Snowflake) -> bool:
-        # We could just use an lur cache decorator here.
-        if user in self._expiring_map:
-            return time.monotonic() >= self._expiring_map[user]
+        return None
 
-        token = await self.__loads_tokens(user)
-        self._expiring_map[user] = token["expires"]
-        return time.monotonic() >= token["expires"]
+    def _spawn_write(
+        self, owner: hikari.Snowflake, write: collections.Awaitable[typing.Any]
+    ) -> None:
+        task = self._pending_writes[owner] = asyncio.ensure_future(write)
+        task.add_done_callback(functools.partial(self._on_write_done, owner))
 
-    # Dump the authorized data as a string JSON object.
+    def _on_write_done(
+        self, owner: hikari.Snowflake, task: asyncio.Future[typing.Any]
+    ) -> None:
+        if self._pending_writes.get(owner) is task:
+            del self._pending_writes[owner]
+
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            _LOG.error("Failed to write to redis.", exc_info=exc)
+
+    # Dump the authorized data as a JSON object.
     async def __dump_tokens(
         self,
         owner: hikari.Snowflake,
         access_token: str,
         refresh_token: str,
-        expires_in: float,
+        expires_at: float,
+        *,
+        wait: bool = True,
     ) -> models.Tokens:
-        assert self.__connection is not None
-        now = datetime.datetime.now(datetime.UTC)
-        payload = data_binding.default_json_dumps(
+        now = time.time()
+        payload = _dumps(
             {
                 "access": access_token,
                 "refresh": refresh_token,
-                "expires": expires_in,
-                "date": str(now),
+                "expires": expires_at,
+                "date": now,
             }
         )
-        await self.__connection.hset(
-            name="tokens", key=str(owner), value=payload.decode()
-        )  # type: ignore
-        return models.Tokens(
-            access=access_token, refresh=refresh_token, expires=expires_in, date=now
+        write = typing.cast(
+            "collections.Awaitable[int]",
+            self._connection().hset(
+                name="tokens",
+                key=_snowflake_key(owner),
+                # redis-py sends bytes as is, its annotations only say str.
+                value=payload,  # type: ignore
+            ),
+        )
+        tokens = self._tokens[owner] = models.Tokens(
+            access_token, refresh_token, expires_at, now
+        )
+        if wait:
+            await write
+        else:
+            self._spawn_write(owner, write)
+
+        return tokens
+
+    async def __refresh_and_dump(
+        self, owner: hikari.Snowflake, tokens: models.Tokens, generation: _Generation
+    ) -> models.Tokens:
+        response = await self.__refresh_token(owner, tokens)
+        if self._generations.get(owner) is not generation:
+            raise LookupError(f"Tokens for {owner} were removed while refreshing")
+
+        # The new tokens are cached in memory already,
+        # so the caller doesn't need to wait for redis to store them.
+        refreshed = await self.__dump_tokens(
+            owner,
+            response.access_token,
+            response.refresh_token,
+            _expires_at(response.expires_in),
+            wait=False,
+        )
+        _LOG.info(
+            "Refreshed tokens for %s Last refresh was %s",
+            owner,
+            _format_date(tokens.date),
         )
+        return refreshed
 
     # Loads the authorized data from a string JSON object to a Python dict object.
-    async def __loads_tokens(self, owner: hikari.Snowflake) -> models.Tokens:
-        assert self.__connection is not None
-        resp: str = await self.__connection.hget("tokens", str(owner))  # type: ignore
+    async def __loads_tokens(
+        self, owner: hikari.Snowflake, generation: _Generation
+    ) -> models.Tokens:
+        # redis-py shares its command types with the sync client, so the async
+        # reply has to be narrowed by hand.
+        resp = await typing.cast(
+            "collections.Awaitable[bytes | None]",
+            self._connection().hget("tokens", _snowflake_key(owner)),
+        )
+        # Removed while we were reading them.
+        if self._generations.get(owner) is not generation:
+            raise LookupError(f"Tokens not found for {owner}") from None
+
         if resp:
-            data = data_binding.default_json_loads(str(resp))
-            assert isinstance(data, dict)
-            return models.Tokens(**data)
+            # orjson reads the raw reply bytes directly, no need to decode it first.
+            data = typing.cast(dict[str, typing.Any], _loads(resp))
+            tokens = _decode_tokens(data)
+            # A refresh may have landed in memory before redis got the write.
+            current = self._tokens.get(owner)
+            if current is not None and current.date >= tokens.date:
+                return current
+
+            self._tokens[owner] = tokens
+            return tokens
 
         raise LookupError(f"Tokens not found for {owner}") from None
 
     async def __refresh_token(
-        self, owner: hikari.Snowflake
+        self, owner: hikari.Snowflake, tokens: models.Tokens
     ) -> aiobungie.builders.OAuth2Response:
         assert self._aiobungie_client is not None
 
-        tokens = await self.__loads_tokens(owner)
-        refresh = tokens.get("refresh")
-
         try:
-            response = await self._aiobungie_client.rest.refresh_access_token(refresh)
-            _LOG.info(
-                "Refreshed tokens for %s Last refresh was %s", owner, tokens["date"]
+            response = await self._aiobungie_client.rest.refresh_access_token(
+                tokens.refresh
             )
         except aiobungie.BadRequest as err:
             raise RuntimeError(
@@ -192,15 +367,10 @@ class Hash(traits.HashRunner):
         return response
 
 
-@typing.final
-class Memory(hikari_collections.FreezableDict[MKT, MVT]):
+class Memory(dict[MKT, MVT]):
     """In-Memory cache."""
 
-    if typing.TYPE_CHECKING:
-        _data: collections.MutableMapping[MKT, MVT]
-
-    def __init__(self) -> None:
-        super().__init__()
+    __slots__ = ()
 
     def view(self) -> str:
         return self.__repr__()
@@ -210,9 +380,67 @@ class Memory(hikari_collections.FreezableDict[MKT, MVT]):
         return self
 
     def __repr__(self) -> str:
-        if not self._data:
+        if not self:
             return "`EmptyCache`"
 
         return "\n".join(
-            boxed.with_block(f"MemoryCache({k}={v!r})") for k, v in self._data.items()
+            boxed.with_block(f"MemoryCache({k}={v!r})") for k, v in self.items()
         )
+
+
+@typing.final
+class BoundedMemory(Memory[MKT, MVT]):
+    """An In-Memory cache that evicts its least recently used entries
+    once it holds more than `capacity` of them.
+    """
+
+    __slots__ = ("_capacity",)
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__()
+        self._capacity = capacity
+
+    # Dicts keep insertion order, so re-inserting a key marks it as the most
+    # recently used one and the first key is always the least recently used.
+    def __getitem__(self, key: MKT) -> MVT:
+        value = super().pop(key)
+        super().__setitem__(key, value)
+        return value
+
+    def __setitem__(self, key: MKT, value: MVT) -> None:
+        super().pop(key, None)
+        super().__setitem__(key, value)
+        if len(self) > self._capacity:
+            del self[next(iter(self))]
+
+    @typing.overload
+    def get(self, key: MKT, /) -> MVT | None:
+        ...
+
+    @typing.overload
+    def get(self, key: MKT, default: MVT | _T, /) -> MVT | _T:
+        ...
+
+    # Hits count as a use, same as __getitem__.
+    def get(self, key: MKT, default: typing.Any = None, /) -> typing.Any:
+        if (value := super().pop(key, _MISSING)) is _MISSING:
+            return default
+
+        super().__setitem__(key, value)
+        return value
+
+    def setdefault(self, key: MKT, default: MVT, /) -> MVT:
+        if (value := self.get(key, _MISSING)) is _MISSING:
+            self[key] = value = default
+
+        return value
+
+    # dict's own update and |= write straight into the table,
+    # which would skip __setitem__ and the capacity with it.
+    def update(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        for key, value in dict[MKT, MVT](*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: typing.Any) -> BoundedMemory[MKT, MVT]:
+        self.update(other)
+        return self
@@ -26,10 +26,23 @@ from __future__ import annotations
 __all__: tuple[str] = ("Config",)
 
 import functools
+import typing
 
 import attrs
 from hikari.api import config as hikari_config
 
+_REDIS_HOST: typing.Final[str] = "127.0.0.1"
+_REDIS_PORT: typing.Final[int] = 6379
+# Token lookups are short HGET/HSET calls, a handful of connections is plenty.
+_REDIS_POOL_SIZE: typing.Final[int] = 8
+
+_CACHE_COMPONENTS: typing.Final[hikari_config.CacheComponents] = (
+    hikari_config.CacheComponents.GUILD_CHANNELS
+    | hikari_config.CacheComponents.GUILDS
+    | hikari_config.CacheComponents.MEMBERS
+    | hikari_config.CacheComponents.ROLES
+)
+
 
 @attrs.frozen
 class Config:
@@ -47,9 +60,10 @@ class Config:
     DB_HOST: str = "127.0.0.1"
     DB_PORT: int = 5432
 
-    REDIS_HOST: str = "127.0.0.1"
-    REDIS_PORT: int = 6379
+    REDIS_HOST: str = _REDIS_HOST
+    REDIS_PORT: int = _REDIS_PORT
     REDIS_PASSWORD: str | None = None
+    REDIS_POOL_SIZE: int = _REDIS_POOL_SIZE
 
     @classmethod
     @functools.cache
@@ -71,9 +85,10 @@ class Config:
             BUNGIE_TOKEN=_os.environ.get("BUNGIE_TOKEN", ""),
             BUNGIE_CLIENT_ID=int(_os.environ.get("BUNGIE_CLIENT_TOKEN", 0)),
             BUNGIE_CLIENT_SECRET=_os.environ.get("BUNGIE_CLIENT_SECRET", ""),
-            REDIS_HOST=_os.environ.get("REDIS_HOST", cls.REDIS_HOST),
-            REDIS_PORT=int(_os.environ.get("REDIS_PORT", cls.REDIS_PORT)),
+            REDIS_HOST=_os.environ.get("REDIS_HOST", _REDIS_HOST),
+            REDIS_PORT=int(_os.environ.get("REDIS_PORT", _REDIS_PORT)),
             REDIS_PASSWORD=_os.environ.get("REDIS_PASSWORD"),
+            REDIS_POOL_SIZE=int(_os.environ.get("REDIS_POOL_SIZE", _REDIS_POOL_SIZE)),
         )
 
     def verify_bungie_tokens(self) -> bool:
@@ -83,9 +98,4 @@ class Config:
 
     @staticmethod
     def cache_settings() -> hikari_config.CacheComponents:
-        return (
-            hikari_config.CacheComponents.GUILD_CHANNELS
-            | hikari_config.CacheComponents.GUILDS
-            | hikari_config.CacheComponents.MEMBERS
-            | hikari_config.CacheComponents.ROLES
-        )
+        return _CACHE_COMPONENTS
@@ -28,57 +28,135 @@ from __future__ import annotations
 __all__: tuple[str] = ("HTTPNet",)
 
 import asyncio
-import contextlib
 import datetime
+import email.utils
+import functools
 import http
 import logging
 import random
+import types
 import typing
 
 import aiohttp
 import hikari
+import yarl
 from hikari import _about as about
 from hikari.internal import data_binding, net
-from yuyo import backoff
 
 from . import traits
 
-if typing.TYPE_CHECKING:
-    import types
+_LOG: typing.Final[logging.Logger] = logging.getLogger("core.net")
 
+_USER_AGENT: typing.Final[str] = (
+    f"Fated DiscordBot(https://github.com/nxtlo/Fated) Hikari/{about.__version__}"
+)
+# These never change, so they're built once and shared by every request.
+_HEADERS: typing.Final[typing.Mapping[str, str]] = types.MappingProxyType(
+    {"User-Agent": _USER_AGENT}
+)
+
+
+_MAX_RETRIES: typing.Final[int] = 4
+# The longest we'll sleep between two attempts.
+_MAX_BACKOFF: typing.Final[float] = 30.0
+# Sending any of these twice has the same effect as sending it once.
+_IDEMPOTENT_METHODS: typing.Final[frozenset[str]] = frozenset(("GET", "PUT", "DELETE"))
+# Errors from a proxy or an overloaded server, which a later attempt can get past.
+_RETRY_STATUSES: typing.Final[frozenset[int]] = frozenset(
+    (
+        http.HTTPStatus.BAD_GATEWAY.value,
+        http.HTTPStatus.SERVICE_UNAVAILABLE.value,
+        http.HTTPStatus.GATEWAY_TIMEOUT.value,
+    )
+)
+
+# Plain ints so status checks don't go through the HTTPStatus enum.
+_OK: typing.Final[int] = http.HTTPStatus.OK.value
+_MULTIPLE_CHOICES: typing.Final[int] = http.HTTPStatus.MULTIPLE_CHOICES.value
+_TOO_MANY_REQUESTS: typing.Final[int] = http.HTTPStatus.TOO_MANY_REQUESTS.value
+
+
+# Exponential backoff with jitter, capped at `_MAX_BACKOFF`.
+def _backoff(attempt: int) -> float:
+    return min(_MAX_BACKOFF, 0.25 * (1 << attempt)) * (0.5 + random.random())
+
+
+# Endpoints are module constants, so each one is only parsed once.
+# Callers with path/query parameters should format the URL once and reuse it.
+@functools.lru_cache(maxsize=512)
+def _url(url: str) -> yarl.URL:
+    return yarl.URL(url)
 
-_LOG: typing.Final[logging.Logger] = logging.getLogger("core.net")
+
+# How long the server asked us to wait before retrying, in seconds.
+def _retry_after(headers: typing.Mapping[str, str]) -> float | None:
+    if (value := headers.get("Retry-After")) is not None:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        # It can also be an HTTP-date.
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max((date - now).total_seconds(), 0.0)
+
+    if (value := headers.get("X-RateLimit-Reset-After")) is not None:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    return None
 
 
 @typing.final
 class HTTPNet(traits.NetRunner):
     """A client to make HTTP requests with."""
 
-    __slots__: typing.Sequence[str] = ("_session", "_lock")
+    __slots__: typing.Sequence[str] = ("_session", "_connector")
 
-    def __init__(self, lock: asyncio.Lock | None = None) -> None:
+    def __init__(self) -> None:
         self._session: aiohttp.ClientSession | None = None
-        self._lock = lock
+        self._connector: aiohttp.TCPConnector | None = None
 
     async def close(self) -> None:
-        if self._session is None:
-            raise RuntimeError("Cannot close a session that's already running.")
-        await self._session.close()
-        self._session = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
-    async def _create_session(self):
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+        _LOG.debug("Closed client session %s", datetime.datetime.now().astimezone())
+
+    # The session lives as long as the bot does, so pooled connections,
+    # resolved hosts and TLS sessions are reused between commands.
+    def _acquire_session(self) -> aiohttp.ClientSession:
         if self._session is not None:
-            raise RuntimeError("Session is already running...")
+            return self._session
+
+        http_settings = hikari.impl.HTTPSettings(force_close_transports=False)
+        if self._connector is None:
+            self._connector = net.create_tcp_connector(http_settings)
 
-        http_settings = hikari.impl.HTTPSettings()
-        connector = net.create_tcp_connector(http_settings)
         self._session = net.create_client_session(
-            connector,
+            self._connector,
             connector_owner=False,
             http_settings=http_settings,
             raise_for_status=False,
             trust_env=False,
         )
+        _LOG.debug("Acquired client session %s", datetime.datetime.now().astimezone())
+        return self._session
 
     @typing.overload
     async def request(
@@ -111,17 +189,15 @@ class HTTPNet(traits.NetRunner):
         *,
         unwrap_bytes: bool = False,
     ) -> data_binding.JSONObject | data_binding.JSONArray | bytes | None:
-        if not self._lock:
-            self._lock = asyncio.Lock()
-
-        async with self._lock:
-            return await self._request(
-                method=method,
-                url=url,
-                getter=getter,
-                unwrap_bytes=unwrap_bytes,
-                json=json,
-            )
+        # aiohttp sessions are safe to share between tasks,
+        # the connector's limit is what bounds how many requests run at once.
+        return await self._request(
+            method=method,
+            url=url,
+            getter=getter,
+            unwrap_bytes=unwrap_bytes,
+            json=json,
+        )
 
     async def _request(
         self,
@@ -132,73 +208,83 @@ class HTTPNet(traits.NetRunner):
         *,
         unwrap_bytes: bool | None = False,
     ) -> data_binding.JSONObject | data_binding.JSONArray | bytes | None:
-        assert self._session is not None
-        data: data_binding.JSONObject | data_binding.JSONArray | bytes | None = None
-        backoff_ = backoff.Backoff(max_retries=4)
-
-        user_agent: typing.Final[
-            str
-        ] = f"Fated DiscordBot(https://github.com/nxtlo/Fated) Hikari/{about.__version__}"
-
-        headers = {}
-        headers["User-Agent"] = user_agent
-
-        stack = contextlib.AsyncExitStack()
-
-        while True:
-            async for _ in backoff_:
-                try:
-                    response = await stack.enter_async_context(
-                        self._session.request(method, url, json=json, headers=headers)
+        session = self._acquire_session()
+        url_ = _url(url)
+
+        retry_after: float | None = None
+        for attempt in range(_MAX_RETRIES):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(attempt) if retry_after is None else retry_after
+                )
+
+            # Leaving the block releases the connection back to the pool,
+            # even when we retry.
+            async with session.request(
+                method, url_, json=json, headers=_HEADERS
+            ) as response:
+                if _OK <= response.status < _MULTIPLE_CHOICES:
+                    if unwrap_bytes:
+                        return await response.read()
+
+                    if response.content_type != "application/json":
+                        return None
+
+                    data = data_binding.default_json_loads(await response.read())
+                    _LOG.debug(
+                        "%s Success from %s", method, response.real_url.human_repr()
                     )
 
-                    if (
-                        http.HTTPStatus.MULTIPLE_CHOICES
-                        > response.status
-                        >= http.HTTPStatus.OK
-                    ):
-                        if not data:
-                            return None
-
-                        if unwrap_bytes:
-                            return await response.read()
-
-                        if response.content_type == "application/json":
-                            data = data_binding.default_json_loads(
-                                await response.read()
-                            )
-                            _LOG.debug(
-                                "%s Success from %s\n%s",
-                                method,
-                                response.real_url.human_repr(),
+                    if getter:
+                        try:
+                            return data[getter]  # type: ignore
+                        except KeyError:
+                            raise LookupError(
+                                f"Key {getter} not found in {data!r}"
+                                f"{response.real_url!s}",
                             )
 
-                            if getter:
-                                try:
-                                    return data[getter]  # type: ignore
-                                except KeyError:
-                                    raise LookupError(
-                                        f"Key {getter} not found in {data!r}"
-                                        f"{response.real_url!s}",
-                                    )
-
-                            return data
-
-                    # Handle the ratelimiting.
-                    if response.status == http.HTTPStatus.TOO_MANY_REQUESTS:
-                        _LOG.warning(
-                            f"We're being ratelimited {response.headers}, {method}::{response.url.human_repr()}"
-                        )
-                        backoff_.set_next_backoff(random.random() / 2)
-
-                    response.raise_for_status()
+                    return data
 
-                except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError):
-                    raise
+                last_attempt = attempt == _MAX_RETRIES - 1
+                # Handle the ratelimiting.
+                if response.status == _TOO_MANY_REQUESTS and not last_attempt:
+                    _LOG.warning(
+                        "We're being ratelimited %s, %s::%s",
+                        response.headers,
+                        method,
+                        response.url.human_repr(),
+                    )
+                    retry_after = _retry_after(response.headers)
+                    if retry_after is not None:
+                        # Some jitter so concurrent retries don't line up,
+                        # clamped so a huge Retry-After can't stall the caller.
+                        retry_after = min(
+                            retry_after * random.uniform(0.9, 1.1), _MAX_BACKOFF
+                        )
 
-    async def __aenter__(self):
-        await self._create_session()
-        _LOG.debug("Acquired client session %s", datetime.datetime.now().astimezone())
+                    continue
+
+                if (
+                    response.status in _RETRY_STATUSES
+                    and method in _IDEMPOTENT_METHODS
+                    and not last_attempt
+                ):
+                    retry_after = None
+                    continue
+
+                # raise_for_status() lets 1xx and 3xx responses through.
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=response.reason or "",
+                    headers=response.headers,
+                )
+
+    # The session is shared, so entering and exiting doesn't open or close it,
+    # that's done once by the client's lifecycle callbacks.
+    async def __aenter__(self) -> HTTPNet:
         return self
 
     async def __aexit__(
@@ -207,8 +293,7 @@ class HTTPNet(traits.NetRunner):
         __: BaseException | None,
         ___: types.TracebackType | None,
     ) -> None:
-        await self.close()
-        _LOG.debug("Closed client session %s", datetime.datetime.now().astimezone())
+        return None
 
     def __repr__(self) -> str:
         return f"HTTPNet(session: {self._session!r})"
@@ -34,8 +34,6 @@ __all__: tuple[str, ...] = (
 
 import typing
 
-from hikari.internal import fast_protocol as fast  # too long >:
-
 if typing.TYPE_CHECKING:
     import collections.abc as collections
     import pathlib
@@ -49,8 +47,7 @@ if typing.TYPE_CHECKING:
     from core import models
 
 
-@typing.runtime_checkable
-class HashRunner(fast.FastProtocolChecking, typing.Protocol):
+class HashRunner(typing.Protocol):
     """An interface for a fast key->value redis hash."""
 
     __slots__ = ()
@@ -75,8 +72,7 @@ class HashRunner(fast.FastProtocolChecking, typing.Protocol):
         raise NotImplementedError
 
 
-@typing.runtime_checkable
-class PartialPool(fast.FastProtocolChecking, typing.Protocol):
+class PartialPool(typing.Protocol):
     """Partial pool trait. Types that can perform core connection requests."""
 
     __slots__ = ()
@@ -128,8 +124,7 @@ class PartialPool(fast.FastProtocolChecking, typing.Protocol):
         raise NotImplementedError
 
 
-@typing.runtime_checkable
-class PoolRunner(fast.FastProtocolChecking, typing.Protocol):
+class PoolRunner(typing.Protocol):
     """Core pool trait that implements direct methods to tables."""
 
     __slots__ = ()
@@ -160,8 +155,7 @@ class PoolRunner(fast.FastProtocolChecking, typing.Protocol):
         raise NotImplementedError
 
 
-@typing.runtime_checkable
-class NetRunner(fast.FastProtocolChecking, typing.Protocol):
+class NetRunner(typing.Protocol):
     """An interface for an HTTP client."""
 
     __slots__ = ()